@@ -0,0 +1,243 @@
+import asyncio
+import logging
+import os
+import sqlite3
+import time
+from collections import deque
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from db_manager import DatabaseManager
+
+logger = logging.getLogger(__name__)
+
+# Параметры резервного копирования
+BACKUP_INTERVAL = 6 * 60 * 60  # Интервал между плановыми копиями, секунд
+BACKUP_KEEP = 7  # Количество хранимых копий
+LATENCY_SAMPLES = 1000  # Количество хранимых замеров задержки
+
+class LatencyStats:
+    """Класс для сбора задержек обработчиков во время и вне резервного копирования"""
+
+    def __init__(self, size: int = LATENCY_SAMPLES):
+        """
+        Инициализация статистики
+
+        Args:
+            size: Количество хранимых замеров для каждого режима
+        """
+        self.samples = {
+            "backup": deque(maxlen=size),
+            "idle": deque(maxlen=size),
+        }
+
+    def record(self, duration: float, during_backup: bool) -> None:
+        """
+        Сохранение замера
+
+        Args:
+            duration: Длительность обработки, секунд
+            during_backup: Выполнялось ли в этот момент резервное копирование
+        """
+        self.samples["backup" if during_backup else "idle"].append(duration)
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """
+        Сводка по замерам
+
+        Returns:
+            Dict[str, Dict[str, float]]: Количество, средняя и максимальная задержка (мс) по режимам
+        """
+        result = {}
+        for mode, samples in self.samples.items():
+            if samples:
+                result[mode] = {
+                    "count": len(samples),
+                    "avg_ms": sum(samples) / len(samples) * 1000,
+                    "max_ms": max(samples) * 1000,
+                }
+            else:
+                result[mode] = {"count": 0, "avg_ms": 0.0, "max_ms": 0.0}
+        return result
+
+class BackupManager:
+    """Класс для онлайн-резервного копирования базы данных через SQLite backup API"""
+
+    def __init__(self, db: DatabaseManager, backup_dir: str = "backups",
+                 interval: float = BACKUP_INTERVAL, keep: int = BACKUP_KEEP):
+        """
+        Инициализация менеджера резервного копирования
+
+        Args:
+            db: Экземпляр менеджера базы данных
+            backup_dir: Каталог для хранения копий
+            interval: Интервал между плановыми копиями, секунд
+            keep: Количество хранимых копий
+        """
+        if keep < 1:
+            raise ValueError("Количество хранимых копий должно быть не меньше 1")
+        self.db = db
+        self.backup_dir = backup_dir
+        self.interval = interval
+        self.keep = keep
+        self.latency = LatencyStats()
+        self.in_progress = False
+        self._lock = asyncio.Lock()
+        os.makedirs(backup_dir, exist_ok=True)
+        logger.info(f"Резервные копии сохраняются в {backup_dir}")
+
+    async def run_periodic(self) -> None:
+        """Плановое резервное копирование с заданным интервалом"""
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.create_backup()
+            except Exception as e:
+                logger.error(f"Ошибка при плановом резервном копировании: {e}")
+
+    async def create_backup(self, protect: Optional[str] = None) -> str:
+        """
+        Создание резервной копии без блокировки обработчиков
+
+        Копирование выполняется в отдельном потоке через собственное соединение
+        за один шаг. В режиме WAL копия читается из снимка базы, поэтому запись
+        через рабочее соединение не блокируется и не перезапускает копирование.
+
+        Args:
+            protect: Имя копии, которую нельзя удалять при очистке (опционально)
+
+        Returns:
+            str: Путь к созданной копии
+        """
+        async with self._lock:
+            name = f"tasks_{datetime.now().strftime('%Y%m%d_%H%M%S_%f')}.db"
+            path = os.path.join(self.backup_dir, name)
+            self.in_progress = True
+            started = time.monotonic()
+            try:
+                cancelled = await self._run_in_thread(self._backup_to_file, path)
+            finally:
+                self.in_progress = False
+
+            logger.info(f"Резервная копия {name} создана за {time.monotonic() - started:.2f} с")
+            self._log_latency()
+            self._apply_retention(protect)
+            if cancelled:
+                raise asyncio.CancelledError()
+            return path
+
+    @staticmethod
+    async def _run_in_thread(func, *args) -> bool:
+        """
+        Выполнение функции в отдельном потоке с ожиданием ее завершения даже при отмене
+
+        Поток нельзя прервать, поэтому при отмене вызывающей задачи функция
+        все равно дожидается его завершения и сообщает об отмене.
+
+        Returns:
+            bool: Была ли отменена вызывающая задача
+        """
+        future = asyncio.ensure_future(asyncio.to_thread(func, *args))
+        cancelled = False
+        while not future.done():
+            try:
+                await asyncio.shield(future)
+            except asyncio.CancelledError:
+                cancelled = True
+        future.result()
+        return cancelled
+
+    def _backup_to_file(self, path: str) -> None:
+        """Копирование базы в файл с проверкой целостности (выполняется в отдельном потоке)"""
+        tmp_path = path + ".tmp"
+        src = sqlite3.connect(self.db.db_path)
+        dst = sqlite3.connect(tmp_path)
+        try:
+            src.backup(dst, pages=-1)
+            if not self._check_integrity(dst):
+                raise sqlite3.DatabaseError(f"Копия {path} не прошла проверку целостности")
+        except Exception:
+            dst.close()
+            os.remove(tmp_path)
+            raise
+        finally:
+            src.close()
+        dst.close()
+        os.replace(tmp_path, path)
+
+    @staticmethod
+    def _check_integrity(conn: sqlite3.Connection) -> bool:
+        """Проверка целостности базы данных"""
+        result = conn.execute("PRAGMA integrity_check").fetchone()
+        return result is not None and result[0] == "ok"
+
+    def list_backups(self) -> List[str]:
+        """
+        Получение списка резервных копий
+
+        Returns:
+            List[str]: Имена файлов копий, от новых к старым
+        """
+        return sorted(
+            (name for name in os.listdir(self.backup_dir)
+             if name.startswith("tasks_") and name.endswith(".db")),
+            reverse=True
+        )
+
+    def _apply_retention(self, protect: Optional[str] = None) -> None:
+        """Удаление копий сверх лимита хранения (кроме копии protect)"""
+        for name in self.list_backups()[self.keep:]:
+            if name == protect:
+                continue
+            os.remove(os.path.join(self.backup_dir, name))
+            logger.info(f"Удалена устаревшая резервная копия {name}")
+
+    async def restore(self, name: str) -> None:
+        """
+        Восстановление базы данных из резервной копии
+
+        Перед восстановлением создается копия текущего состояния базы.
+        Проверка и копирование выполняются в отдельном потоке через собственное
+        соединение, поэтому цикл событий не блокируется. Чтение в режиме WAL
+        продолжается, запись ожидает окончания восстановления.
+
+        Args:
+            name: Имя файла копии из list_backups()
+        """
+        if name not in self.list_backups():
+            raise ValueError(f"Резервная копия {name} не найдена")
+
+        path = os.path.join(self.backup_dir, name)
+        await self.create_backup(protect=name)
+        async with self._lock:
+            # Незавершенная транзакция рабочего соединения заблокировала бы запись копии
+            self.db.conn.commit()
+            cancelled = await self._run_in_thread(self._restore_from_file, path)
+        logger.info(f"База данных восстановлена из копии {name}")
+        if cancelled:
+            raise asyncio.CancelledError()
+
+    def _restore_from_file(self, path: str) -> None:
+        """Проверка копии и запись ее в рабочую базу (выполняется в отдельном потоке)"""
+        src = sqlite3.connect(path)
+        try:
+            if not self._check_integrity(src):
+                raise sqlite3.DatabaseError(f"Копия {os.path.basename(path)} не прошла проверку целостности")
+            dst = sqlite3.connect(self.db.db_path)
+            try:
+                src.backup(dst)
+            finally:
+                dst.close()
+        finally:
+            src.close()
+
+    def _log_latency(self) -> None:
+        """Запись в лог задержек обработчиков во время резервного копирования"""
+        summary = self.latency.summary()
+        logger.info(
+            f"Задержка обработчиков во время копирования: "
+            f"ср. {summary['backup']['avg_ms']:.1f} мс, макс. {summary['backup']['max_ms']:.1f} мс "
+            f"({summary['backup']['count']} замеров); вне копирования: "
+            f"ср. {summary['idle']['avg_ms']:.1f} мс, макс. {summary['idle']['max_ms']:.1f} мс "
+            f"({summary['idle']['count']} замеров)"
+        )
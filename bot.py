@@ -1,22 +1,67 @@
 import asyncio
 import logging
-from typing import Optional, Dict, Any
+import os
+import signal
+import tempfile
+import time
+from typing import Optional, Dict, Any, List, Set, Union, Coroutine
 from aiogram import Bot, Dispatcher, types
-from aiogram.filters import Command
+from aiogram.client.session.aiohttp import AiohttpSession
+from aiogram.filters import Command, CommandObject
 from aiogram.fsm.context import FSMContext
 from aiogram.fsm.state import State, StatesGroup
 from aiogram.fsm.storage.memory import MemoryStorage
 from aiogram.types import ReplyKeyboardMarkup, KeyboardButton, ReplyKeyboardRemove
-from aiogram.exceptions import TelegramAPIError
-from aiogram.types import Message, CallbackQuery
+from aiogram.exceptions import (
+    TelegramAPIError, TelegramForbiddenError, TelegramRetryAfter, TelegramUnauthorizedError
+)
+from aiogram.methods import GetUpdates
+from aiogram.types import Message, CallbackQuery, FSInputFile
 from aiogram.utils.keyboard import InlineKeyboardBuilder
+from aiogram.utils.token import TokenValidationError
 from datetime import datetime
 
+from backup_manager import BackupManager
 from db_manager import DatabaseManager, Task
+from rate_limiter import RateLimiter
+from task_io import (
+    EXPORT_FORMATS, IMPORT_FORMATS, TaskExportWriter,
+    batched, detect_format, iter_task_records, parse_task_record
+)
 
 # Настройка логгера
 logger = logging.getLogger("bot.main")
 
+# Параметры рассылки
+BROADCAST_CHUNK_SIZE = 100  # Пользователей в одной порции (одна контрольная точка на порцию)
+BROADCAST_CONCURRENCY = 10  # Одновременных запросов к Telegram
+BROADCAST_RATE_LIMIT = 25  # Сообщений в секунду (глобальный лимит Telegram ~30)
+BROADCAST_MAX_RETRIES = 3  # Повторов при TelegramRetryAfter
+
+# Параметры импорта и экспорта задач
+IMPORT_BATCH_SIZE = 500  # Задач в одной транзакции
+IMPORT_MAX_FILE_SIZE = 10 * 1024 * 1024  # Максимальный размер файла импорта
+IMPORT_MAX_ROWS = 100_000  # Максимальное количество задач в одном импорте
+EXPORT_CHUNK_SIZE = 1000  # Задач в одной порции чтения
+EXPORT_MAX_FILE_SIZE = 50 * 1024 * 1024  # Лимит Telegram на отправку файлов ботом
+PROGRESS_UPDATE_INTERVAL = 2.0  # Секунд между обновлениями сообщения о прогрессе
+
+# Параметры получения обновлений
+POLLING_TIMEOUT = 10  # Секунд ожидания обновлений в одном запросе getUpdates
+POLLING_MAX_BACKOFF = 60  # Максимальная пауза после ошибки getUpdates, секунд
+
+def parse_admin_ids(value: str) -> List[int]:
+    """
+    Разбор списка ID администраторов из переменной окружения
+    
+    Args:
+        value: Строка с ID через запятую
+        
+    Returns:
+        List[int]: Список ID администраторов
+    """
+    return [int(item) for item in value.split(",") if item.strip()]
+
 # Состояния FSM
 class TaskStates(StatesGroup):
     """Состояния для создания и управления задачами"""
@@ -24,23 +69,71 @@ class TaskStates(StatesGroup):
     waiting_for_description = State()
     waiting_for_deletion = State()
     waiting_for_completion = State()
+    waiting_for_import_file = State()
 
 class BotManager:
-    """Класс для управления ботом и обработки команд"""
+    """
+    Класс для управления ботами и обработки команд
     
-    def __init__(self, token: str, db: DatabaseManager):
+    Все боты работают в одном цикле событий и используют общие диспетчер,
+    HTTP-сессию, базу данных и метрики. Данные ботов разделены по bot_id.
+    """
+    
+    def __init__(self, tokens: Union[str, List[str]], db: DatabaseManager,
+                 admin_ids: Optional[List[int]] = None,
+                 backup_manager: Optional[BackupManager] = None,
+                 tenants_file: str = "tenants.txt"):
         """
-        Инициализация бота
+        Инициализация ботов
         
         Args:
-            token: Токен бота
+            tokens: Токен бота или список токенов
             db: Экземпляр менеджера базы данных
+            admin_ids: Список ID администраторов (опционально)
+            backup_manager: Менеджер резервного копирования (опционально)
+            tenants_file: Файл с токенами ботов, подключенных командой /addbot
         """
-        self.token = token
-        self.bot = Bot(token=token)
+        if isinstance(tokens, str):
+            tokens = [tokens]
+        self.session = AiohttpSession()
         self.storage = MemoryStorage()
         self.dp = Dispatcher(storage=self.storage)
         self.db = db
+        self.admin_ids = set(admin_ids or [])
+        self.backup_manager = backup_manager or BackupManager(db)
+        self._background_tasks: Set[asyncio.Task] = set()
+        self._stop_event: Optional[asyncio.Event] = None
+        
+        # Объекты отдельных ботов
+        self.bots: Dict[int, Bot] = {}
+        self.rate_limiters: Dict[int, RateLimiter] = {}
+        self.metrics: Dict[int, Dict[str, float]] = {}
+        self._polling_tasks: Dict[int, asyncio.Task] = {}
+        self._broadcast_tasks: Dict[int, Set[asyncio.Task]] = {}
+        self._pending_tenants: Set[int] = set()
+        
+        # Токены ботов, подключенных во время работы, хранятся вне базы данных,
+        # чтобы не попадать в резервные копии
+        self.tenants_file = tenants_file
+        self._runtime_tokens: Dict[int, str] = {}
+        for token in tokens:
+            self._register_tenant(Bot(token=token, session=self.session))
+        for token in self._load_tenant_tokens():
+            try:
+                bot = Bot(token=token, session=self.session)
+            except TokenValidationError:
+                # Одна поврежденная строка не должна мешать запуску остальных ботов
+                logger.error(f"Некорректный токен в {self.tenants_file} пропущен")
+                continue
+            self._runtime_tokens[bot.id] = token
+            self._register_tenant(bot)
+        
+        # Данные, созданные до поддержки нескольких ботов, принадлежат первому боту
+        if tokens:
+            self.db.claim_legacy_rows(next(iter(self.bots)))
+        
+        # Замеряем задержку обработчиков (в том числе во время резервного копирования)
+        self.dp.update.outer_middleware(self._measure_latency)
         
         # Регистрируем обработчики команд
         self.dp.message.register(self.cmd_start, Command(commands=["start"]))
@@ -49,24 +142,159 @@ class BotManager:
         self.dp.message.register(self.cmd_tasks, Command(commands=["tasks"]))
         self.dp.message.register(self.cmd_delete, Command(commands=["delete"]))
         self.dp.message.register(self.cmd_complete, Command(commands=["complete"]))
+        self.dp.message.register(self.cmd_broadcast, Command(commands=["broadcast"]))
+        self.dp.message.register(self.cmd_import, Command(commands=["import"]))
+        self.dp.message.register(self.cmd_export, Command(commands=["export"]))
+        self.dp.message.register(self.cmd_backup, Command(commands=["backup"]))
+        self.dp.message.register(self.cmd_backups, Command(commands=["backups"]))
+        self.dp.message.register(self.cmd_restore, Command(commands=["restore"]))
+        self.dp.message.register(self.cmd_stats, Command(commands=["stats"]))
+        self.dp.message.register(self.cmd_add_bot, Command(commands=["addbot"]))
+        self.dp.message.register(self.cmd_remove_bot, Command(commands=["removebot"]))
         
         # Регистрируем обработчики состояний
         self.dp.message.register(self.process_task_title, TaskStates.waiting_for_title)
         self.dp.message.register(self.process_task_description, TaskStates.waiting_for_description)
+        self.dp.message.register(self.process_import_file, TaskStates.waiting_for_import_file)
         
         # Регистрируем обработчик callback-запросов
         self.dp.callback_query.register(self.process_callback)
         
-        logger.info("Бот инициализирован")
+        logger.info(f"Инициализировано ботов: {len(self.bots)}")
+    
+    def _register_tenant(self, bot: Bot) -> None:
+        """Регистрация объектов бота"""
+        if bot.id in self.bots:
+            return
+        self.bots[bot.id] = bot
+        self.rate_limiters[bot.id] = RateLimiter(BROADCAST_RATE_LIMIT)
+        self.metrics[bot.id] = {"updates": 0, "errors": 0, "total_time": 0.0}
+    
+    async def add_tenant(self, token: str) -> Bot:
+        """
+        Подключение нового бота без перезапуска
+        
+        Args:
+            token: Токен бота
+            
+        Returns:
+            Bot: Подключенный бот
+        """
+        bot = Bot(token=token, session=self.session)
+        if bot.id in self.bots or bot.id in self._pending_tenants:
+            raise ValueError(f"Бот {bot.id} уже подключен")
+        
+        # Резервируем ID на время проверки, чтобы параллельный /addbot не запустил второй опрос
+        self._pending_tenants.add(bot.id)
+        try:
+            await bot.get_me()
+        finally:
+            self._pending_tenants.discard(bot.id)
+        
+        self._runtime_tokens[bot.id] = token
+        self._save_tenant_tokens()
+        self._register_tenant(bot)
+        if self._stop_event is not None:
+            self._start_polling(bot)
+            self._resume_broadcasts(bot.id)
+        logger.info(f"Бот {bot.id} подключен")
+        return bot
+    
+    def remove_tenant(self, bot_id: int) -> None:
+        """
+        Отключение бота без перезапуска (данные бота в базе сохраняются)
+        
+        Args:
+            bot_id: ID бота
+        """
+        if bot_id not in self.bots:
+            raise ValueError(f"Бот {bot_id} не подключен")
+        
+        task = self._polling_tasks.pop(bot_id, None)
+        if task is not None:
+            task.cancel()
+        # Прерванные рассылки остаются незавершенными и продолжатся при повторном подключении
+        for task in self._broadcast_tasks.pop(bot_id, set()):
+            task.cancel()
+        del self.bots[bot_id]
+        del self.rate_limiters[bot_id]
+        del self.metrics[bot_id]
+        if self._runtime_tokens.pop(bot_id, None) is not None:
+            self._save_tenant_tokens()
+        logger.info(f"Бот {bot_id} отключен")
+    
+    def _load_tenant_tokens(self) -> List[str]:
+        """Чтение токенов ботов, подключенных во время работы"""
+        if not os.path.exists(self.tenants_file):
+            return []
+        with open(self.tenants_file, encoding="utf-8") as file:
+            return [line.strip() for line in file if line.strip()]
+    
+    def _save_tenant_tokens(self) -> None:
+        """Сохранение токенов ботов, подключенных во время работы (доступно только владельцу)"""
+        tmp_path = self.tenants_file + ".tmp"
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "w", encoding="utf-8") as file:
+            file.write("".join(f"{token}\n" for token in self._runtime_tokens.values()))
+        os.replace(tmp_path, self.tenants_file)
+    
+    def _spawn(self, coro: Coroutine) -> asyncio.Task:
+        """Запуск фоновой задачи"""
+        task = asyncio.create_task(coro)
+        # Храним ссылку, чтобы задачу не удалил сборщик мусора
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
+        return task
+    
+    def _start_polling(self, bot: Bot) -> None:
+        """Запуск получения обновлений для бота"""
+        self._polling_tasks[bot.id] = self._spawn(self._poll(bot))
+    
+    async def _poll(self, bot: Bot) -> None:
+        """
+        Получение обновлений для одного бота (long polling)
+        
+        Обновления всех ботов передаются в общий диспетчер, поэтому
+        подключение бота не требует отдельного Dispatcher.
+        """
+        allowed_updates = self.dp.resolve_used_update_types()
+        offset = None
+        backoff = 1.0
+        while True:
+            try:
+                updates = await bot(
+                    GetUpdates(offset=offset, timeout=POLLING_TIMEOUT, allowed_updates=allowed_updates),
+                    request_timeout=int(self.session.timeout + POLLING_TIMEOUT)
+                )
+                backoff = 1.0
+            except TelegramUnauthorizedError:
+                logger.error(f"Токен бота {bot.id} недействителен, получение обновлений остановлено")
+                return
+            except Exception as e:
+                logger.error(f"Ошибка при получении обновлений для бота {bot.id}: {e}")
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, POLLING_MAX_BACKOFF)
+                continue
+            
+            for update in updates:
+                offset = update.update_id + 1
+                self._spawn(self._process_update(bot, update))
+    
+    async def _process_update(self, bot: Bot, update: types.Update) -> None:
+        """Передача обновления в диспетчер"""
+        try:
+            await self.dp.feed_update(bot, update)
+        except Exception as e:
+            logger.error(f"Ошибка при обработке обновления {update.update_id} бота {bot.id}: {e}")
 
-    async def cmd_start(self, message: types.Message) -> None:
+    async def cmd_start(self, message: types.Message, bot: Bot) -> None:
         """Обработчик команды /start"""
         try:
             user_id = message.from_user.id
             username = message.from_user.username or message.from_user.first_name
             
             # Регистрируем пользователя
-            self.db.add_user(user_id, username)
+            self.db.add_user(bot.id, user_id, username)
             logger.info(f"Зарегистрирован новый пользователь @{username} (ID: {user_id})")
             
             # Создаем клавиатуру
@@ -118,6 +346,8 @@ class BotManager:
             "/tasks - Показать список задач\n"
             "/delete - Удалить задачу\n"
             "/complete - Отметить задачу как выполненную\n"
+            "/import - Импортировать задачи из файла CSV/JSON\n"
+            "/export - Выгрузить задачи в файл (/export csv или /export json)\n"
             "/help - Показать это сообщение\n\n"
             "Для создания задачи:\n"
             "1. Нажмите 'Создать задачу' или используйте /new\n"
@@ -142,7 +372,7 @@ class BotManager:
             logger.error(f"Ошибка при создании новой задачи: {e}")
             await message.answer("❌ Произошла ошибка. Попробуйте позже.")
     
-    async def process_task_title(self, message: types.Message, state: FSMContext) -> None:
+    async def process_task_title(self, message: types.Message, state: FSMContext, bot: Bot) -> None:
         """Обработчик ввода названия задачи"""
         try:
             user_id = message.from_user.id
@@ -150,7 +380,7 @@ class BotManager:
             title = message.text
             
             # Сохраняем название задачи
-            task_id = self.db.add_task(user_id, title)
+            task_id = self.db.add_task(bot.id, user_id, title)
             logger.info(f"Создана новая задача с ID {task_id} для пользователя @{username}")
             
             # Переходим к вводу описания
@@ -163,7 +393,7 @@ class BotManager:
             await message.answer("❌ Произошла ошибка. Попробуйте позже.")
             await state.clear()
     
-    async def process_task_description(self, message: types.Message, state: FSMContext) -> None:
+    async def process_task_description(self, message: types.Message, state: FSMContext, bot: Bot) -> None:
         """Обработчик ввода описания задачи"""
         try:
             user_id = message.from_user.id
@@ -177,8 +407,8 @@ class BotManager:
             # Получаем последнюю задачу пользователя
             cursor = self.db.conn.cursor()
             cursor.execute(
-                "SELECT id FROM tasks WHERE user_id = ? ORDER BY created_at DESC LIMIT 1",
-                (user_id,)
+                "SELECT id FROM tasks WHERE bot_id = ? AND user_id = ? ORDER BY created_at DESC LIMIT 1",
+                (bot.id, user_id)
             )
             task_id = cursor.fetchone()[0]
             
@@ -197,11 +427,11 @@ class BotManager:
             await message.answer("❌ Произошла ошибка. Попробуйте позже.")
             await state.clear()
     
-    async def cmd_tasks(self, message: Message):
+    async def cmd_tasks(self, message: Message, bot: Bot):
         """Обработчик команды /tasks"""
         try:
             logger.info(f"Пользователь @{message.from_user.username} запросил список задач")
-            tasks = self.db.get_user_tasks(message.from_user.id)
+            tasks = self.db.get_user_tasks(bot.id, message.from_user.id)
             
             if not tasks:
                 await message.answer("У вас пока нет задач. Создайте новую с помощью команды /new")
@@ -224,7 +454,7 @@ class BotManager:
             logger.error(f"Ошибка при получении списка задач: {e}")
             await message.answer("Произошла ошибка при получении списка задач. Попробуйте позже.")
     
-    async def cmd_delete(self, message: types.Message) -> None:
+    async def cmd_delete(self, message: types.Message, bot: Bot) -> None:
         """Обработчик команды /delete"""
         try:
             user_id = message.from_user.id
@@ -233,8 +463,8 @@ class BotManager:
             # Получаем все задачи пользователя
             cursor = self.db.conn.cursor()
             cursor.execute(
-                "SELECT id, title FROM tasks WHERE user_id = ? ORDER BY created_at DESC",
-                (user_id,)
+                "SELECT id, title FROM tasks WHERE bot_id = ? AND user_id = ? ORDER BY created_at DESC",
+                (bot.id, user_id)
             )
             tasks = cursor.fetchall()
             
@@ -260,7 +490,7 @@ class BotManager:
             logger.error(f"Ошибка при получении списка задач для удаления: {e}")
             await message.answer("❌ Произошла ошибка. Попробуйте позже.")
     
-    async def cmd_complete(self, message: types.Message) -> None:
+    async def cmd_complete(self, message: types.Message, bot: Bot) -> None:
         """Обработчик команды /complete"""
         try:
             user_id = message.from_user.id
@@ -269,8 +499,8 @@ class BotManager:
             # Получаем незавершенные задачи пользователя
             cursor = self.db.conn.cursor()
             cursor.execute(
-                "SELECT id, title FROM tasks WHERE user_id = ? AND status = 0 ORDER BY created_at DESC",
-                (user_id,)
+                "SELECT id, title FROM tasks WHERE bot_id = ? AND user_id = ? AND status = 0 ORDER BY created_at DESC",
+                (bot.id, user_id)
             )
             tasks = cursor.fetchall()
             
@@ -296,14 +526,312 @@ class BotManager:
             logger.error(f"Ошибка при получении списка задач для отметки: {e}")
             await message.answer("❌ Произошла ошибка. Попробуйте позже.")
     
-    async def process_callback(self, callback_query: CallbackQuery):
+    async def cmd_import(self, message: types.Message, state: FSMContext) -> None:
+        """Обработчик команды /import"""
+        try:
+            username = message.from_user.username or message.from_user.first_name
+            
+            await state.set_state(TaskStates.waiting_for_import_file)
+            await message.answer(
+                "📥 Отправьте файл с задачами в формате CSV, JSON или JSONL "
+                f"(до {IMPORT_MAX_FILE_SIZE // (1024 * 1024)} МБ, не более {IMPORT_MAX_ROWS} задач).\n\n"
+                "Поля: title (обязательно), description, status.\n"
+                "Для отмены отправьте /cancel"
+            )
+            logger.info(f"Пользователь @{username} начал импорт задач")
+        except Exception as e:
+            logger.error(f"Ошибка при запуске импорта задач: {e}")
+            await message.answer("❌ Произошла ошибка. Попробуйте позже.")
+    
+    async def process_import_file(self, message: types.Message, state: FSMContext, bot: Bot) -> None:
+        """Обработчик файла импорта задач"""
+        if message.text == "/cancel":
+            await state.clear()
+            await message.answer("Импорт отменен.")
+            return
+        
+        document = message.document
+        if document is None:
+            await message.answer("📎 Отправьте файл с задачами или /cancel для отмены.")
+            return
+        
+        fmt = detect_format(document.file_name)
+        if fmt is None:
+            await message.answer(f"❌ Поддерживаются только файлы: {', '.join(IMPORT_FORMATS)}.")
+            return
+        if document.file_size and document.file_size > IMPORT_MAX_FILE_SIZE:
+            await message.answer(
+                f"❌ Файл слишком большой. Максимум {IMPORT_MAX_FILE_SIZE // (1024 * 1024)} МБ."
+            )
+            return
+        
+        await state.clear()
+        user_id = message.from_user.id
+        username = message.from_user.username or message.from_user.first_name
+        imported = 0
+        skipped = 0
+        path = None
+        status_message = await message.answer("⏳ Импорт задач...")
+        
+        try:
+            fd, path = tempfile.mkstemp(suffix=f".{fmt}")
+            os.close(fd)
+            await bot.download(document, destination=path)
+            
+            # Telegram не всегда сообщает размер файла заранее
+            if os.path.getsize(path) > IMPORT_MAX_FILE_SIZE:
+                await self._edit_progress(
+                    status_message,
+                    f"❌ Файл слишком большой. Максимум {IMPORT_MAX_FILE_SIZE // (1024 * 1024)} МБ."
+                )
+                return
+            
+            last_update = time.monotonic()
+            truncated = False
+            with open(path, encoding="utf-8-sig", newline="") as file:
+                for batch in batched(iter_task_records(file, fmt), IMPORT_BATCH_SIZE):
+                    tasks = []
+                    for record in batch:
+                        if imported + len(tasks) >= IMPORT_MAX_ROWS:
+                            truncated = True
+                            break
+                        task = parse_task_record(record)
+                        if task is None:
+                            skipped += 1
+                        else:
+                            tasks.append(task)
+                    
+                    if tasks:
+                        imported += self.db.add_tasks_batch(bot.id, user_id, tasks)
+                    if truncated:
+                        break
+                    
+                    # Отдаем управление циклу событий между транзакциями
+                    await asyncio.sleep(0)
+                    if time.monotonic() - last_update >= PROGRESS_UPDATE_INTERVAL:
+                        last_update = time.monotonic()
+                        await self._edit_progress(status_message, f"⏳ Импортировано задач: {imported}")
+            
+            response = f"✅ Импортировано задач: {imported}"
+            if skipped:
+                response += f"\n⚠️ Пропущено некорректных записей: {skipped}"
+            if truncated:
+                response += f"\n⚠️ Достигнут лимит в {IMPORT_MAX_ROWS} задач, остальные записи не импортированы"
+            await self._edit_progress(status_message, response)
+            logger.info(f"Пользователь @{username} импортировал {imported} задач (пропущено {skipped})")
+        except (ValueError, UnicodeDecodeError) as e:
+            logger.warning(f"Некорректный файл импорта от пользователя @{username}: {e}")
+            await self._edit_progress(
+                status_message,
+                f"❌ Не удалось разобрать файл: {e}\nИмпортировано задач до ошибки: {imported}"
+            )
+        except Exception as e:
+            logger.error(f"Ошибка при импорте задач: {e}")
+            await self._edit_progress(
+                status_message,
+                f"❌ Произошла ошибка. Импортировано задач до ошибки: {imported}"
+            )
+        finally:
+            if path and os.path.exists(path):
+                os.remove(path)
+    
+    async def cmd_export(self, message: types.Message, command: CommandObject, bot: Bot) -> None:
+        """Обработчик команды /export"""
+        fmt = (command.args or "csv").strip().lower()
+        if fmt not in EXPORT_FORMATS:
+            await message.answer(f"Использование: /export [{' | '.join(EXPORT_FORMATS)}]")
+            return
+        
+        user_id = message.from_user.id
+        username = message.from_user.username or message.from_user.first_name
+        exported = 0
+        path = None
+        status_message = await message.answer("⏳ Выгрузка задач...")
+        
+        try:
+            fd, path = tempfile.mkstemp(suffix=f".{fmt}")
+            last_update = time.monotonic()
+            with os.fdopen(fd, "w", encoding="utf-8", newline="") as file:
+                writer = TaskExportWriter(file, fmt)
+                for tasks in self.db.iter_user_tasks(bot.id, user_id, EXPORT_CHUNK_SIZE):
+                    writer.write_rows(tasks)
+                    exported += len(tasks)
+                    if file.tell() > EXPORT_MAX_FILE_SIZE:
+                        await self._edit_progress(
+                            status_message,
+                            f"❌ Файл выгрузки превышает {EXPORT_MAX_FILE_SIZE // (1024 * 1024)} МБ."
+                        )
+                        return
+                    
+                    await asyncio.sleep(0)
+                    if time.monotonic() - last_update >= PROGRESS_UPDATE_INTERVAL:
+                        last_update = time.monotonic()
+                        await self._edit_progress(status_message, f"⏳ Выгружено задач: {exported}")
+                writer.close()
+            
+            if not exported:
+                await self._edit_progress(status_message, "📝 У вас пока нет задач.")
+                return
+            
+            await message.answer_document(
+                FSInputFile(path, filename=f"tasks.{fmt}"),
+                caption=f"📤 Выгружено задач: {exported}"
+            )
+            await self._edit_progress(status_message, f"✅ Выгружено задач: {exported}")
+            logger.info(f"Пользователь @{username} выгрузил {exported} задач в формате {fmt}")
+        except Exception as e:
+            logger.error(f"Ошибка при выгрузке задач: {e}")
+            await self._edit_progress(status_message, "❌ Произошла ошибка. Попробуйте позже.")
+        finally:
+            if path and os.path.exists(path):
+                os.remove(path)
+    
+    async def _edit_progress(self, status_message: Message, text: str) -> None:
+        """Обновление сообщения о ходе длительной операции"""
+        try:
+            await status_message.edit_text(text)
+        except TelegramAPIError as e:
+            logger.warning(f"Не удалось обновить сообщение о прогрессе: {e}")
+    
+    async def _measure_latency(self, handler, event, data):
+        """Middleware для замера длительности обработки обновлений"""
+        started = time.monotonic()
+        metrics = self.metrics.get(data["bot"].id)
+        try:
+            return await handler(event, data)
+        except Exception:
+            if metrics is not None:
+                metrics["errors"] += 1
+            raise
+        finally:
+            duration = time.monotonic() - started
+            self.backup_manager.latency.record(duration, self.backup_manager.in_progress)
+            if metrics is not None:
+                metrics["updates"] += 1
+                metrics["total_time"] += duration
+    
+    async def cmd_stats(self, message: types.Message) -> None:
+        """Обработчик команды /stats (только для администраторов)"""
+        if message.from_user.id not in self.admin_ids:
+            await message.answer("❌ Команда доступна только администраторам.")
+            return
+        response = f"📊 Подключено ботов: {len(self.bots)}\n\n"
+        for bot_id, metrics in self.metrics.items():
+            avg_ms = metrics["total_time"] / metrics["updates"] * 1000 if metrics["updates"] else 0.0
+            response += (
+                f"🤖 Бот {bot_id}: обновлений {metrics['updates']:.0f}, "
+                f"ошибок {metrics['errors']:.0f}, ср. {avg_ms:.1f} мс\n"
+            )
+        response += f"\n⚙️ Фоновых задач: {len(self._background_tasks)}"
+        await message.answer(response)
+    
+    async def cmd_add_bot(self, message: types.Message, command: CommandObject) -> None:
+        """Обработчик команды /addbot (только для администраторов)"""
+        if message.from_user.id not in self.admin_ids:
+            await message.answer("❌ Команда доступна только администраторам.")
+            return
+        token = (command.args or "").strip()
+        if not token:
+            await message.answer("Использование: /addbot <токен бота>")
+            return
+        
+        # Не оставляем токен в истории чата
+        try:
+            await message.delete()
+        except TelegramAPIError as e:
+            logger.warning(f"Не удалось удалить сообщение с токеном: {e}")
+        
+        try:
+            bot = await self.add_tenant(token)
+            await message.answer(f"✅ Бот {bot.id} подключен")
+        except ValueError as e:
+            await message.answer(f"❌ {e}")
+        except Exception as e:
+            logger.error(f"Ошибка при подключении бота: {e}")
+            await message.answer("❌ Не удалось подключить бота. Проверьте токен.")
+    
+    async def cmd_remove_bot(self, message: types.Message, command: CommandObject) -> None:
+        """Обработчик команды /removebot (только для администраторов)"""
+        if message.from_user.id not in self.admin_ids:
+            await message.answer("❌ Команда доступна только администраторам.")
+            return
+        try:
+            bot_id = int((command.args or "").strip())
+        except ValueError:
+            await message.answer("Использование: /removebot <ID бота>\nСписок ботов: /stats")
+            return
+        try:
+            self.remove_tenant(bot_id)
+            await message.answer(
+                f"✅ Бот {bot_id} отключен. Если его токен задан в BOT_TOKENS, "
+                "после перезапуска он будет подключен снова."
+            )
+        except ValueError as e:
+            await message.answer(f"❌ {e}")
+    
+    async def cmd_backup(self, message: types.Message) -> None:
+        """Обработчик команды /backup (только для администраторов)"""
+        if message.from_user.id not in self.admin_ids:
+            await message.answer("❌ Команда доступна только администраторам.")
+            return
+        try:
+            await message.answer("⏳ Создание резервной копии...")
+            path = await self.backup_manager.create_backup()
+            await message.answer(f"✅ Резервная копия создана: {os.path.basename(path)}")
+        except Exception as e:
+            logger.error(f"Ошибка при создании резервной копии: {e}")
+            await message.answer("❌ Не удалось создать резервную копию.")
+    
+    async def cmd_backups(self, message: types.Message) -> None:
+        """Обработчик команды /backups (только для администраторов)"""
+        if message.from_user.id not in self.admin_ids:
+            await message.answer("❌ Команда доступна только администраторам.")
+            return
+        try:
+            backups = self.backup_manager.list_backups()
+            latency = self.backup_manager.latency.summary()
+            response = "💾 Резервные копии:\n\n"
+            response += "\n".join(backups) if backups else "Копий пока нет"
+            response += (
+                "\n\n⏱ Задержка обработчиков:\n"
+                f"во время копирования: ср. {latency['backup']['avg_ms']:.1f} мс, "
+                f"макс. {latency['backup']['max_ms']:.1f} мс\n"
+                f"вне копирования: ср. {latency['idle']['avg_ms']:.1f} мс, "
+                f"макс. {latency['idle']['max_ms']:.1f} мс\n\n"
+                "Для восстановления: /restore <имя файла>"
+            )
+            await message.answer(response)
+        except Exception as e:
+            logger.error(f"Ошибка при получении списка резервных копий: {e}")
+            await message.answer("❌ Произошла ошибка. Попробуйте позже.")
+    
+    async def cmd_restore(self, message: types.Message, command: CommandObject) -> None:
+        """Обработчик команды /restore (только для администраторов)"""
+        if message.from_user.id not in self.admin_ids:
+            await message.answer("❌ Команда доступна только администраторам.")
+            return
+        name = (command.args or "").strip()
+        if not name:
+            await message.answer("Использование: /restore <имя файла>\nСписок копий: /backups")
+            return
+        try:
+            await self.backup_manager.restore(name)
+            logger.info(f"Администратор @{message.from_user.username} восстановил базу из копии {name}")
+            await message.answer(f"✅ База данных восстановлена из копии {name}")
+        except ValueError as e:
+            await message.answer(f"❌ {e}")
+        except Exception as e:
+            logger.error(f"Ошибка при восстановлении базы данных: {e}")
+            await message.answer("❌ Не удалось восстановить базу данных.")
+    
+    async def process_callback(self, callback_query: CallbackQuery, bot: Bot):
         """Обработчик callback-запросов от кнопок"""
         try:
             data = callback_query.data
             user_id = callback_query.from_user.id
             
             if data == "list_tasks":
-                tasks = self.db.get_user_tasks(user_id)
+                tasks = self.db.get_user_tasks(bot.id, user_id)
                 if not tasks:
                     await callback_query.message.answer("У вас пока нет задач. Создайте новую с помощью команды /new")
                     return
@@ -322,7 +850,7 @@ class BotManager:
                 await callback_query.message.answer(response)
             
             elif data == "delete_task":
-                tasks = self.db.get_user_incomplete_tasks(user_id)
+                tasks = self.db.get_user_incomplete_tasks(bot.id, user_id)
                 if not tasks:
                     await callback_query.message.answer("У вас нет задач для удаления")
                     return
@@ -340,7 +868,7 @@ class BotManager:
                 )
             
             elif data == "complete_task":
-                tasks = self.db.get_user_incomplete_tasks(user_id)
+                tasks = self.db.get_user_incomplete_tasks(bot.id, user_id)
                 if not tasks:
                     await callback_query.message.answer("У вас нет незавершенных задач")
                     return
@@ -359,13 +887,13 @@ class BotManager:
             
             elif data.startswith("delete_"):
                 task_id = int(data.split("_")[1])
-                self.db.delete_task(task_id)
+                self.db.delete_task(bot.id, task_id)
                 logger.info(f"Пользователь @{callback_query.from_user.username} удалил задачу {task_id}")
                 await callback_query.message.answer(f"✅ Задача #{task_id} удалена")
             
             elif data.startswith("complete_"):
                 task_id = int(data.split("_")[1])
-                self.db.complete_task(task_id)
+                self.db.complete_task(bot.id, task_id)
                 logger.info(f"Пользователь @{callback_query.from_user.username} отметил задачу {task_id} как выполненную")
                 await callback_query.message.answer(f"✅ Задача #{task_id} отмечена как выполненная")
             
@@ -376,24 +904,195 @@ class BotManager:
             await callback_query.message.answer("Произошла ошибка. Попробуйте позже.")
             await callback_query.answer()
     
+    async def cmd_broadcast(self, message: types.Message, command: CommandObject, bot: Bot) -> None:
+        """Обработчик команды /broadcast (только для администраторов)"""
+        try:
+            user_id = message.from_user.id
+            username = message.from_user.username or message.from_user.first_name
+            
+            if user_id not in self.admin_ids:
+                logger.warning(f"Пользователь @{username} попытался запустить рассылку без прав")
+                await message.answer("❌ Команда доступна только администраторам.")
+                return
+            
+            text = command.args
+            if not text:
+                await message.answer("Использование: /broadcast <текст сообщения>")
+                return
+            
+            broadcast_id = self.db.create_broadcast(bot.id, user_id, text)
+            logger.info(f"Администратор @{username} запустил рассылку {broadcast_id} для бота {bot.id}")
+            self._start_broadcast(broadcast_id, bot.id, user_id, text)
+        except Exception as e:
+            logger.error(f"Ошибка при запуске рассылки: {e}")
+            await message.answer("❌ Произошла ошибка. Попробуйте позже.")
+    
+    def _start_broadcast(self, broadcast_id: int, bot_id: int, admin_id: int, text: str,
+                         last_user_id: int = 0, delivered: int = 0,
+                         blocked: int = 0, failed: int = 0) -> None:
+        """Запуск рассылки в фоновой задаче"""
+        task = self._spawn(self._run_broadcast(
+            broadcast_id, self.bots[bot_id], admin_id, text, last_user_id, delivered, blocked, failed
+        ))
+        # Храним задачи по ботам, чтобы отменить их при отключении бота
+        tasks = self._broadcast_tasks.setdefault(bot_id, set())
+        tasks.add(task)
+        task.add_done_callback(tasks.discard)
+    
+    async def _run_broadcast(self, broadcast_id: int, bot: Bot, admin_id: int, text: str,
+                             last_user_id: int, delivered: int,
+                             blocked: int, failed: int) -> None:
+        """
+        Выполнение рассылки порциями с сохранением прогресса
+        
+        Пользователи читаются порциями по возрастанию user_id, после каждой порции
+        прогресс сохраняется в базу. При перезапуске порция, прерванная на середине,
+        будет отправлена повторно.
+        """
+        counters = {"delivered": delivered, "blocked": blocked, "failed": failed}
+        semaphore = asyncio.Semaphore(BROADCAST_CONCURRENCY)
+        # Лимит Telegram действует для каждого бота отдельно
+        rate_limiter = self.rate_limiters[bot.id]
+        status_message = None
+        
+        async def send(user_id: int) -> None:
+            async with semaphore:
+                counters[await self._send_broadcast_message(bot, rate_limiter, user_id, text)] += 1
+        
+        try:
+            status_message = await bot.send_message(
+                admin_id, self._format_broadcast_status(broadcast_id, counters, "🚀 запущена")
+            )
+        except TelegramAPIError as e:
+            logger.error(f"Не удалось отправить статус рассылки {broadcast_id}: {e}")
+        
+        try:
+            while True:
+                user_ids = self.db.get_users_after(bot.id, last_user_id, BROADCAST_CHUNK_SIZE)
+                if not user_ids:
+                    break
+                
+                await asyncio.gather(*(send(user_id) for user_id in user_ids))
+                last_user_id = user_ids[-1]
+                self.db.update_broadcast_progress(
+                    broadcast_id, last_user_id,
+                    counters["delivered"], counters["blocked"], counters["failed"]
+                )
+                await self._update_broadcast_status(
+                    status_message, broadcast_id, counters, "⏳ в процессе"
+                )
+            
+            self.db.finish_broadcast(broadcast_id)
+            logger.info(f"Рассылка {broadcast_id} завершена: {counters}")
+            await self._update_broadcast_status(status_message, broadcast_id, counters, "✅ завершена")
+        except asyncio.CancelledError:
+            logger.info(f"Рассылка {broadcast_id} прервана на пользователе {last_user_id}")
+            raise
+        except Exception as e:
+            logger.error(f"Ошибка при выполнении рассылки {broadcast_id}: {e}")
+            await self._update_broadcast_status(status_message, broadcast_id, counters, "❌ ошибка")
+    
+    async def _send_broadcast_message(self, bot: Bot, rate_limiter: RateLimiter,
+                                      user_id: int, text: str) -> str:
+        """
+        Отправка одного сообщения рассылки с учетом лимитов Telegram
+        
+        Returns:
+            str: Результат отправки: delivered, blocked или failed
+        """
+        for attempt in range(BROADCAST_MAX_RETRIES):
+            await rate_limiter.wait()
+            try:
+                await bot.send_message(user_id, text)
+                return "delivered"
+            except TelegramRetryAfter as e:
+                # Останавливаем всех отправителей: повторные запросы во время
+                # ожидания увеличивают штраф Telegram
+                logger.warning(f"Превышен лимит запросов, ожидание {e.retry_after} с")
+                rate_limiter.pause(e.retry_after)
+                if attempt == BROADCAST_MAX_RETRIES - 1:
+                    return "failed"
+            except TelegramForbiddenError:
+                return "blocked"
+            except TelegramAPIError as e:
+                logger.error(f"Ошибка при отправке сообщения пользователю {user_id}: {e}")
+                return "failed"
+        return "failed"
+    
+    def _format_broadcast_status(self, broadcast_id: int, counters: Dict[str, int], state: str) -> str:
+        """Формирование текста статуса рассылки"""
+        return (
+            f"📢 Рассылка #{broadcast_id}: {state}\n\n"
+            f"✅ Доставлено: {counters['delivered']}\n"
+            f"🚫 Заблокировали бота: {counters['blocked']}\n"
+            f"❌ Ошибок: {counters['failed']}"
+        )
+    
+    async def _update_broadcast_status(self, status_message: Optional[Message], broadcast_id: int,
+                                       counters: Dict[str, int], state: str) -> None:
+        """Обновление сообщения со статусом рассылки у администратора"""
+        if status_message is None:
+            return
+        try:
+            await status_message.edit_text(self._format_broadcast_status(broadcast_id, counters, state))
+        except TelegramAPIError as e:
+            logger.warning(f"Не удалось обновить статус рассылки {broadcast_id}: {e}")
+    
+    def _resume_broadcasts(self, bot_id: Optional[int] = None) -> None:
+        """Возобновление рассылок, прерванных при предыдущем запуске"""
+        for row in self.db.get_unfinished_broadcasts():
+            broadcast_id, row_bot_id, admin_id, text, last_user_id, delivered, blocked, failed = row
+            if row_bot_id not in self.bots or (bot_id is not None and row_bot_id != bot_id):
+                continue
+            logger.info(f"Возобновление рассылки {broadcast_id} с пользователя {last_user_id}")
+            self._start_broadcast(
+                broadcast_id, row_bot_id, admin_id, text, last_user_id, delivered, blocked, failed
+            )
+    
     async def run(self) -> None:
-        """Запуск бота"""
+        """Запуск ботов"""
         try:
-            logger.info("Запуск бота...")
-            await self.dp.start_polling(self.bot)
+            logger.info("Запуск ботов...")
+            self._stop_event = asyncio.Event()
+            loop = asyncio.get_running_loop()
+            for sig in (signal.SIGINT, signal.SIGTERM):
+                try:
+                    loop.add_signal_handler(sig, self.stop)
+                except NotImplementedError:
+                    # Windows: остановка по Ctrl+C через KeyboardInterrupt
+                    pass
+            for bot in self.bots.values():
+                self._start_polling(bot)
+            self._resume_broadcasts()
+            backup_task = asyncio.create_task(self.backup_manager.run_periodic())
+            try:
+                await self._stop_event.wait()
+            finally:
+                logger.info("Остановка ботов...")
+                tasks = [backup_task, *self._background_tasks]
+                for task in tasks:
+                    task.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
+                await self.session.close()
         except Exception as e:
             logger.error(f"Ошибка при запуске бота: {e}")
             raise
+    
+    def stop(self) -> None:
+        """Остановка всех ботов"""
+        if self._stop_event is not None:
+            self._stop_event.set()
 
-async def main(token: str) -> None:
+async def main(tokens: Union[str, List[str]], admin_ids: Optional[List[int]] = None) -> None:
     """
     Основная функция запуска бота
     
     Args:
-        token: Токен Telegram бота
+        tokens: Токен Telegram бота или список токенов
+        admin_ids: Список ID администраторов (опционально)
     """
     db = DatabaseManager()
-    bot_manager = BotManager(token, db)
+    bot_manager = BotManager(tokens, db, admin_ids, tenants_file=os.getenv("TENANTS_FILE", "tenants.txt"))
     await bot_manager.run()
 
 if __name__ == "__main__":
@@ -402,8 +1101,12 @@ if __name__ == "__main__":
     from dotenv import load_dotenv
     
     load_dotenv()
-    token = os.getenv("BOT_TOKEN")
-    if not token:
+    tokens = [
+        token.strip()
+        for token in os.getenv("BOT_TOKENS", os.getenv("BOT_TOKEN", "")).split(",")
+        if token.strip()
+    ]
+    if not tokens:
         raise ValueError("Токен бота не найден в переменных окружения")
     
-    asyncio.run(main(token))
\ No newline at end of file
+    asyncio.run(main(tokens, parse_admin_ids(os.getenv("ADMIN_IDS", ""))))
\ No newline at end of file
@@ -1,12 +1,36 @@
 import sqlite3
 import logging
-from typing import List, Tuple, Optional, Any
+from typing import List, Tuple, Optional, Any, Iterator
 from contextlib import contextmanager
 from dataclasses import dataclass
 from datetime import datetime
 
 logger = logging.getLogger(__name__)
 
+# Схемы таблиц с данными ботов (bot_id изолирует данные разных ботов)
+USERS_TABLE_SQL = """
+    CREATE TABLE IF NOT EXISTS {name} (
+        bot_id INTEGER NOT NULL DEFAULT 0,
+        user_id INTEGER NOT NULL,
+        username TEXT NOT NULL,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        PRIMARY KEY (bot_id, user_id)
+    )
+"""
+
+TASKS_TABLE_SQL = """
+    CREATE TABLE IF NOT EXISTS {name} (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        bot_id INTEGER NOT NULL DEFAULT 0,
+        user_id INTEGER NOT NULL,
+        title TEXT NOT NULL,
+        description TEXT,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        status INTEGER DEFAULT 0,
+        FOREIGN KEY (bot_id, user_id) REFERENCES users (bot_id, user_id)
+    )
+"""
+
 @dataclass
 class Task:
     """Класс для представления задачи"""
@@ -30,6 +54,8 @@ class DatabaseManager:
         self.db_path = db_path
         self.conn = sqlite3.connect(db_path)
         self.conn.row_factory = sqlite3.Row
+        # WAL позволяет снимать резервную копию, не блокируя запись
+        self.conn.execute("PRAGMA journal_mode=WAL")
         self._create_tables()
         logger.info(f"База данных инициализирована: {db_path}")
     
@@ -37,44 +63,120 @@ class DatabaseManager:
         """Создание необходимых таблиц в базе данных"""
         cursor = self.conn.cursor()
         
+        # Переводим базу старого формата (без bot_id) на многоарендную схему
+        self._migrate_tenants()
+        
         # Создаем таблицу пользователей
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS users (
-                user_id INTEGER PRIMARY KEY,
-                username TEXT NOT NULL,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        """)
+        cursor.execute(USERS_TABLE_SQL.format(name="users"))
         
         # Создаем таблицу задач
+        cursor.execute(TASKS_TABLE_SQL.format(name="tasks"))
+        
+        # Индекс для постраничного чтения задач пользователя
+        cursor.execute(
+            "CREATE INDEX IF NOT EXISTS idx_tasks_user_id ON tasks (bot_id, user_id, id)"
+        )
+        
+        # Создаем таблицу рассылок (хранит прогресс для возобновления после перезапуска)
         cursor.execute("""
-            CREATE TABLE IF NOT EXISTS tasks (
+            CREATE TABLE IF NOT EXISTS broadcasts (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
-                user_id INTEGER NOT NULL,
-                title TEXT NOT NULL,
-                description TEXT,
+                bot_id INTEGER NOT NULL DEFAULT 0,
+                admin_id INTEGER NOT NULL,
+                text TEXT NOT NULL,
+                last_user_id INTEGER DEFAULT 0,
+                delivered INTEGER DEFAULT 0,
+                blocked INTEGER DEFAULT 0,
+                failed INTEGER DEFAULT 0,
+                status TEXT DEFAULT 'running',
                 created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                status INTEGER DEFAULT 0,
-                FOREIGN KEY (user_id) REFERENCES users (user_id)
+                finished_at TIMESTAMP
             )
         """)
         
         self.conn.commit()
         logger.info("Таблицы созданы")
     
-    def add_user(self, user_id: int, username: str) -> None:
+    def _get_columns(self, table: str) -> List[str]:
+        """Получение списка колонок таблицы (пустой, если таблицы нет)"""
+        cursor = self.conn.cursor()
+        cursor.execute(f"PRAGMA table_info({table})")
+        return [row[1] for row in cursor.fetchall()]
+    
+    def _migrate_tenants(self) -> None:
+        """
+        Добавление колонки bot_id в таблицы базы старого формата
+        
+        Существующие записи получают bot_id = 0 и передаются первому боту
+        через claim_legacy_rows().
+        """
+        columns = self._get_columns("users")
+        if not columns or "bot_id" in columns:
+            return
+        
+        try:
+            cursor = self.conn.cursor()
+            cursor.execute("BEGIN")
+            # SQLite не умеет менять первичный ключ, поэтому пересоздаем таблицы
+            cursor.execute(USERS_TABLE_SQL.format(name="users_new"))
+            cursor.execute(
+                "INSERT INTO users_new (bot_id, user_id, username, created_at) "
+                "SELECT 0, user_id, username, created_at FROM users"
+            )
+            cursor.execute(TASKS_TABLE_SQL.format(name="tasks_new"))
+            cursor.execute(
+                "INSERT INTO tasks_new (id, bot_id, user_id, title, description, created_at, status) "
+                "SELECT id, 0, user_id, title, description, created_at, status FROM tasks"
+            )
+            # Сохраняем счетчик AUTOINCREMENT, чтобы ID удаленных задач не выдавались повторно
+            cursor.execute("DELETE FROM sqlite_sequence WHERE name = 'tasks_new'")
+            cursor.execute(
+                "INSERT INTO sqlite_sequence (name, seq) "
+                "SELECT 'tasks_new', seq FROM sqlite_sequence WHERE name = 'tasks'"
+            )
+            cursor.execute("DROP TABLE tasks")
+            cursor.execute("DROP TABLE users")
+            cursor.execute("ALTER TABLE users_new RENAME TO users")
+            cursor.execute("ALTER TABLE tasks_new RENAME TO tasks")
+            
+            self.conn.commit()
+            logger.info("База данных переведена на многоарендную схему")
+        except Exception as e:
+            self.conn.rollback()
+            logger.error(f"Ошибка при миграции базы данных: {e}")
+            raise
+    
+    def claim_legacy_rows(self, bot_id: int) -> None:
+        """
+        Передача записей, созданных до появления bot_id, указанному боту
+        
+        Args:
+            bot_id: ID бота
+        """
+        try:
+            cursor = self.conn.cursor()
+            cursor.execute("UPDATE OR IGNORE users SET bot_id = ? WHERE bot_id = 0", (bot_id,))
+            cursor.execute("UPDATE tasks SET bot_id = ? WHERE bot_id = 0", (bot_id,))
+            cursor.execute("UPDATE broadcasts SET bot_id = ? WHERE bot_id = 0", (bot_id,))
+            self.conn.commit()
+        except Exception as e:
+            logger.error(f"Ошибка при передаче записей боту {bot_id}: {e}")
+            raise
+    
+    def add_user(self, bot_id: int, user_id: int, username: str) -> None:
         """
         Добавление нового пользователя
         
         Args:
+            bot_id: ID бота
             user_id: ID пользователя в Telegram
             username: Имя пользователя
         """
         try:
             cursor = self.conn.cursor()
             cursor.execute(
-                "INSERT OR IGNORE INTO users (user_id, username) VALUES (?, ?)",
-                (user_id, username)
+                "INSERT OR IGNORE INTO users (bot_id, user_id, username) VALUES (?, ?, ?)",
+                (bot_id, user_id, username)
             )
             self.conn.commit()
             logger.info(f"Пользователь {username} добавлен в базу данных")
@@ -82,11 +184,12 @@ class DatabaseManager:
             logger.error(f"Ошибка при добавлении пользователя: {e}")
             raise
     
-    def add_task(self, user_id: int, title: str, description: str = None) -> int:
+    def add_task(self, bot_id: int, user_id: int, title: str, description: str = None) -> int:
         """
         Добавление новой задачи
         
         Args:
+            bot_id: ID бота
             user_id: ID пользователя
             title: Название задачи
             description: Описание задачи (опционально)
@@ -97,8 +200,8 @@ class DatabaseManager:
         try:
             cursor = self.conn.cursor()
             cursor.execute(
-                "INSERT INTO tasks (user_id, title, description) VALUES (?, ?, ?)",
-                (user_id, title, description)
+                "INSERT INTO tasks (bot_id, user_id, title, description) VALUES (?, ?, ?, ?)",
+                (bot_id, user_id, title, description)
             )
             self.conn.commit()
             task_id = cursor.lastrowid
@@ -108,11 +211,68 @@ class DatabaseManager:
             logger.error(f"Ошибка при добавлении задачи: {e}")
             raise
     
-    def get_user_tasks(self, user_id: int) -> list:
+    def add_tasks_batch(self, bot_id: int, user_id: int, tasks: List[Tuple[str, Optional[str], int]]) -> int:
+        """
+        Добавление порции задач в одной транзакции
+        
+        Args:
+            bot_id: ID бота
+            user_id: ID пользователя
+            tasks: Список задач в виде (название, описание, статус)
+            
+        Returns:
+            int: Количество добавленных задач
+        """
+        try:
+            cursor = self.conn.cursor()
+            cursor.executemany(
+                "INSERT INTO tasks (bot_id, user_id, title, description, status) VALUES (?, ?, ?, ?, ?)",
+                [(bot_id, user_id, title, description, status) for title, description, status in tasks]
+            )
+            self.conn.commit()
+            logger.info(f"Добавлено {len(tasks)} задач для пользователя {user_id}")
+            return len(tasks)
+        except Exception as e:
+            self.conn.rollback()
+            logger.error(f"Ошибка при пакетном добавлении задач: {e}")
+            raise
+    
+    def iter_user_tasks(self, bot_id: int, user_id: int, chunk_size: int) -> Iterator[list]:
+        """
+        Постраничное чтение задач пользователя (keyset-пагинация по id)
+        
+        Args:
+            bot_id: ID бота
+            user_id: ID пользователя
+            chunk_size: Размер порции
+            
+        Returns:
+            Iterator[list]: Итератор по порциям задач
+        """
+        last_id = 0
+        while True:
+            try:
+                cursor = self.conn.cursor()
+                cursor.execute(
+                    "SELECT id, title, description, created_at, status FROM tasks "
+                    "WHERE bot_id = ? AND user_id = ? AND id > ? ORDER BY id LIMIT ?",
+                    (bot_id, user_id, last_id, chunk_size)
+                )
+                tasks = cursor.fetchall()
+            except Exception as e:
+                logger.error(f"Ошибка при чтении задач пользователя: {e}")
+                raise
+            if not tasks:
+                return
+            yield tasks
+            last_id = tasks[-1][0]
+    
+    def get_user_tasks(self, bot_id: int, user_id: int) -> list:
         """
         Получение всех задач пользователя
         
         Args:
+            bot_id: ID бота
             user_id: ID пользователя
             
         Returns:
@@ -121,8 +281,8 @@ class DatabaseManager:
         try:
             cursor = self.conn.cursor()
             cursor.execute(
-                "SELECT id, title, description, created_at, status FROM tasks WHERE user_id = ? ORDER BY created_at DESC",
-                (user_id,)
+                "SELECT id, title, description, created_at, status FROM tasks WHERE bot_id = ? AND user_id = ? ORDER BY created_at DESC",
+                (bot_id, user_id)
             )
             tasks = cursor.fetchall()
             logger.info(f"Получено {len(tasks)} задач для пользователя {user_id}")
@@ -131,11 +291,12 @@ class DatabaseManager:
             logger.error(f"Ошибка при получении задач пользователя: {e}")
             raise
     
-    def get_user_incomplete_tasks(self, user_id: int) -> list:
+    def get_user_incomplete_tasks(self, bot_id: int, user_id: int) -> list:
         """
         Получение незавершенных задач пользователя
         
         Args:
+            bot_id: ID бота
             user_id: ID пользователя
             
         Returns:
@@ -144,8 +305,8 @@ class DatabaseManager:
         try:
             cursor = self.conn.cursor()
             cursor.execute(
-                "SELECT id, title FROM tasks WHERE user_id = ? AND status = 0 ORDER BY created_at DESC",
-                (user_id,)
+                "SELECT id, title FROM tasks WHERE bot_id = ? AND user_id = ? AND status = 0 ORDER BY created_at DESC",
+                (bot_id, user_id)
             )
             tasks = cursor.fetchall()
             logger.info(f"Получено {len(tasks)} незавершенных задач для пользователя {user_id}")
@@ -154,18 +315,19 @@ class DatabaseManager:
             logger.error(f"Ошибка при получении незавершенных задач пользователя: {e}")
             raise
     
-    def complete_task(self, task_id: int) -> None:
+    def complete_task(self, bot_id: int, task_id: int) -> None:
         """
         Отметка задачи как выполненной
         
         Args:
+            bot_id: ID бота
             task_id: ID задачи
         """
         try:
             cursor = self.conn.cursor()
             cursor.execute(
-                "UPDATE tasks SET status = 1 WHERE id = ?",
-                (task_id,)
+                "UPDATE tasks SET status = 1 WHERE id = ? AND bot_id = ?",
+                (task_id, bot_id)
             )
             self.conn.commit()
             logger.info(f"Задача {task_id} отмечена как выполненная")
@@ -173,18 +335,19 @@ class DatabaseManager:
             logger.error(f"Ошибка при отметке задачи как выполненной: {e}")
             raise
     
-    def delete_task(self, task_id: int) -> None:
+    def delete_task(self, bot_id: int, task_id: int) -> None:
         """
         Удаление задачи
         
         Args:
+            bot_id: ID бота
             task_id: ID задачи
         """
         try:
             cursor = self.conn.cursor()
             cursor.execute(
-                "DELETE FROM tasks WHERE id = ?",
-                (task_id,)
+                "DELETE FROM tasks WHERE id = ? AND bot_id = ?",
+                (task_id, bot_id)
             )
             self.conn.commit()
             logger.info(f"Задача {task_id} удалена")
@@ -192,6 +355,115 @@ class DatabaseManager:
             logger.error(f"Ошибка при удалении задачи: {e}")
             raise
     
+    def get_users_after(self, bot_id: int, last_user_id: int, limit: int) -> List[int]:
+        """
+        Получение очередной порции пользователей (keyset-пагинация по user_id)
+        
+        Args:
+            bot_id: ID бота
+            last_user_id: ID последнего обработанного пользователя
+            limit: Максимальный размер порции
+            
+        Returns:
+            List[int]: Список ID пользователей в порядке возрастания
+        """
+        try:
+            cursor = self.conn.cursor()
+            cursor.execute(
+                "SELECT user_id FROM users WHERE bot_id = ? AND user_id > ? ORDER BY user_id LIMIT ?",
+                (bot_id, last_user_id, limit)
+            )
+            return [row[0] for row in cursor.fetchall()]
+        except Exception as e:
+            logger.error(f"Ошибка при получении списка пользователей: {e}")
+            raise
+    
+    def create_broadcast(self, bot_id: int, admin_id: int, text: str) -> int:
+        """
+        Создание новой рассылки
+        
+        Args:
+            bot_id: ID бота
+            admin_id: ID администратора, запустившего рассылку
+            text: Текст рассылки
+            
+        Returns:
+            int: ID созданной рассылки
+        """
+        try:
+            cursor = self.conn.cursor()
+            cursor.execute(
+                "INSERT INTO broadcasts (bot_id, admin_id, text) VALUES (?, ?, ?)",
+                (bot_id, admin_id, text)
+            )
+            self.conn.commit()
+            broadcast_id = cursor.lastrowid
+            logger.info(f"Рассылка {broadcast_id} создана администратором {admin_id}")
+            return broadcast_id
+        except Exception as e:
+            logger.error(f"Ошибка при создании рассылки: {e}")
+            raise
+    
+    def update_broadcast_progress(self, broadcast_id: int, last_user_id: int,
+                                  delivered: int, blocked: int, failed: int) -> None:
+        """
+        Сохранение контрольной точки рассылки
+        
+        Args:
+            broadcast_id: ID рассылки
+            last_user_id: ID последнего обработанного пользователя
+            delivered: Количество доставленных сообщений
+            blocked: Количество пользователей, заблокировавших бота
+            failed: Количество ошибок доставки
+        """
+        try:
+            cursor = self.conn.cursor()
+            cursor.execute(
+                "UPDATE broadcasts SET last_user_id = ?, delivered = ?, blocked = ?, failed = ? WHERE id = ?",
+                (last_user_id, delivered, blocked, failed, broadcast_id)
+            )
+            self.conn.commit()
+        except Exception as e:
+            logger.error(f"Ошибка при сохранении прогресса рассылки: {e}")
+            raise
+    
+    def finish_broadcast(self, broadcast_id: int) -> None:
+        """
+        Отметка рассылки как завершенной
+        
+        Args:
+            broadcast_id: ID рассылки
+        """
+        try:
+            cursor = self.conn.cursor()
+            cursor.execute(
+                "UPDATE broadcasts SET status = 'finished', finished_at = CURRENT_TIMESTAMP WHERE id = ?",
+                (broadcast_id,)
+            )
+            self.conn.commit()
+            logger.info(f"Рассылка {broadcast_id} завершена")
+        except Exception as e:
+            logger.error(f"Ошибка при завершении рассылки: {e}")
+            raise
+    
+    def get_unfinished_broadcasts(self) -> list:
+        """
+        Получение незавершенных рассылок
+        
+        Returns:
+            list: Список незавершенных рассылок
+        """
+        try:
+            cursor = self.conn.cursor()
+            cursor.execute(
+                "SELECT id, bot_id, admin_id, text, last_user_id, delivered, blocked, failed "
+                "FROM broadcasts WHERE status = 'running' ORDER BY id"
+            )
+            return cursor.fetchall()
+        except Exception as e:
+            logger.error(f"Ошибка при получении незавершенных рассылок: {e}")
+            raise
+    
     def __del__(self):
         """Закрытие соединения с базой данных при удалении объекта"""
         if hasattr(self, 'conn'):
@@ -0,0 +1,33 @@
+import asyncio
+import time
+
+class RateLimiter:
+    """Ограничитель частоты запросов: не более rate вызовов в секунду"""
+    
+    def __init__(self, rate: float):
+        """
+        Инициализация ограничителя
+        
+        Args:
+            rate: Максимальное количество вызовов в секунду
+        """
+        self.interval = 1.0 / rate
+        self._lock = asyncio.Lock()
+        self._next_time = 0.0
+    
+    async def wait(self) -> None:
+        """Ожидание следующего разрешенного слота"""
+        async with self._lock:
+            # Срок проверяется повторно: pause() может сдвинуть его, пока мы спим
+            while (delay := self._next_time - time.monotonic()) > 0:
+                await asyncio.sleep(delay)
+            self._next_time = max(self._next_time, time.monotonic()) + self.interval
+    
+    def pause(self, seconds: float) -> None:
+        """
+        Приостановка всех отправителей (например, при TelegramRetryAfter)
+        
+        Args:
+            seconds: Длительность паузы, секунд
+        """
+        self._next_time = max(self._next_time, time.monotonic() + seconds)
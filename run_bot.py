@@ -3,7 +3,8 @@ import sys
 import logging
 import asyncio
 from dotenv import load_dotenv
-from bot import BotManager
+from backup_manager import BackupManager
+from bot import BotManager, parse_admin_ids
 from db_manager import DatabaseManager
 
 # Настройка логирования
@@ -18,20 +19,32 @@ logging.basicConfig(
 
 logger = logging.getLogger(__name__)
 
-async def run_bot(token: str) -> None:
+async def run_bot(tokens: list, admin_ids: list) -> None:
     """
-    Запуск бота
+    Запуск ботов
     
     Args:
-        token: Токен Telegram бота
+        tokens: Список токенов Telegram ботов
+        admin_ids: Список ID администраторов
     """
     try:
         # Инициализируем базу данных
         db = DatabaseManager()
         logger.info("База данных инициализирована")
         
+        # Настраиваем резервное копирование
+        backup_manager = BackupManager(
+            db,
+            backup_dir=os.getenv("BACKUP_DIR", "backups"),
+            interval=float(os.getenv("BACKUP_INTERVAL_HOURS", "6")) * 60 * 60,
+            keep=int(os.getenv("BACKUP_KEEP", "7"))
+        )
+        
         # Создаем и запускаем бота
-        bot_manager = BotManager(token, db)
+        bot_manager = BotManager(
+            tokens, db, admin_ids, backup_manager,
+            tenants_file=os.getenv("TENANTS_FILE", "tenants.txt")
+        )
         logger.info("Бот запущен")
         await bot_manager.run()
     except Exception as e:
@@ -50,14 +63,21 @@ def main() -> None:
             os.chdir(current_dir)
             logger.info(f"Изменена рабочая директория на {current_dir}")
         
-        # Получаем токен бота
-        token = os.getenv("BOT_TOKEN")
-        if not token:
+        # Получаем токены ботов (BOT_TOKENS через запятую или один BOT_TOKEN)
+        tokens = [
+            token.strip()
+            for token in os.getenv("BOT_TOKENS", os.getenv("BOT_TOKEN", "")).split(",")
+            if token.strip()
+        ]
+        if not tokens:
             raise ValueError("Токен бота не найден в переменных окружения")
         
+        # Получаем список администраторов
+        admin_ids = parse_admin_ids(os.getenv("ADMIN_IDS", ""))
+        
         # Запускаем бота
         logger.info("Запуск бота...")
-        asyncio.run(run_bot(token))
+        asyncio.run(run_bot(tokens, admin_ids))
     except Exception as e:
         logger.error(f"Критическая ошибка: {e}")
         sys.exit(1)
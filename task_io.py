@@ -0,0 +1,222 @@
+import csv
+import json
+import os
+import re
+from typing import Iterator, Iterable, List, Optional, Tuple, TextIO, Any
+
+# Поддерживаемые форматы
+IMPORT_FORMATS = ("csv", "json", "jsonl")
+EXPORT_FORMATS = ("csv", "json")
+
+# Поля задачи при экспорте
+EXPORT_FIELDS = ["id", "title", "description", "created_at", "status"]
+
+# Значения статуса, означающие выполненную задачу
+DONE_STATUSES = {"1", "true", "yes", "done", "да", "выполнено"}
+
+# Размер порции чтения JSON-файла
+JSON_READ_CHUNK_SIZE = 64 * 1024
+
+# Символы, которые могут следовать за элементом JSON-массива
+JSON_DELIMITERS = " \t\r\n,]"
+JSON_WHITESPACE = re.compile(r"[ \t\r\n]*")
+
+def detect_format(file_name: Optional[str]) -> Optional[str]:
+    """
+    Определение формата файла по расширению
+
+    Args:
+        file_name: Имя файла
+
+    Returns:
+        Optional[str]: Формат файла или None, если формат не поддерживается
+    """
+    if not file_name:
+        return None
+    fmt = os.path.splitext(file_name)[1].lower().lstrip(".")
+    return fmt if fmt in IMPORT_FORMATS else None
+
+def iter_task_records(file: TextIO, fmt: str) -> Iterator[Any]:
+    """
+    Потоковое чтение записей из файла без загрузки его целиком в память
+
+    Args:
+        file: Открытый текстовый файл
+        fmt: Формат файла (csv, json или jsonl)
+
+    Returns:
+        Iterator[Any]: Итератор по записям файла
+    """
+    if fmt == "csv":
+        yield from csv.DictReader(file)
+    elif fmt == "jsonl":
+        for line in file:
+            if line.strip():
+                yield json.loads(line)
+    elif fmt == "json":
+        yield from _iter_json_array(file)
+    else:
+        raise ValueError(f"Неподдерживаемый формат: {fmt}")
+
+def _iter_json_array(file: TextIO, chunk_size: int = JSON_READ_CHUNK_SIZE) -> Iterator[Any]:
+    """
+    Потоковый разбор JSON-массива верхнего уровня по одному элементу
+
+    Разбор идет по индексу в буфере, буфер сжимается только при чтении новой
+    порции. Если элемент не помещается в буфер, размер дочитываемой порции
+    удваивается, поэтому общий объем работы линейно зависит от размера файла.
+    """
+    decoder = json.JSONDecoder()
+    buffer = ""
+    pos = 0
+    eof = False
+
+    def read_more(size: int) -> None:
+        nonlocal buffer, pos, eof
+        chunk = file.read(size)
+        eof = not chunk
+        buffer = buffer[pos:] + chunk
+        pos = 0
+
+    def skip_whitespace() -> None:
+        nonlocal pos
+        while True:
+            pos = JSON_WHITESPACE.match(buffer, pos).end()
+            if pos < len(buffer) or eof:
+                return
+            read_more(chunk_size)
+
+    skip_whitespace()
+    if pos >= len(buffer):
+        raise ValueError("Файл пуст")
+    if buffer[pos] != "[":
+        raise ValueError("Ожидался JSON-массив задач")
+    pos += 1
+
+    skip_whitespace()
+    if pos < len(buffer) and buffer[pos] == "]":
+        pos += 1
+    else:
+        while True:
+            skip_whitespace()
+            if pos >= len(buffer):
+                raise ValueError("Неожиданный конец JSON-файла")
+
+            read_size = chunk_size
+            while True:
+                try:
+                    item, end = decoder.raw_decode(buffer, pos)
+                except json.JSONDecodeError:
+                    end = None
+                # Значение на границе порции может быть обрезано (например, число), поэтому
+                # принимаем его только если за ним следует разделитель или файл прочитан целиком
+                if end is not None and (eof or (end < len(buffer) and buffer[end] in JSON_DELIMITERS)):
+                    break
+                if eof:
+                    raise ValueError("Некорректный JSON")
+                read_more(read_size)
+                read_size *= 2
+
+            yield item
+            pos = end
+
+            skip_whitespace()
+            if pos >= len(buffer):
+                raise ValueError("Неожиданный конец JSON-файла")
+            if buffer[pos] == "]":
+                pos += 1
+                break
+            if buffer[pos] != ",":
+                raise ValueError("Ожидалась запятая между элементами JSON-массива")
+            pos += 1
+
+    skip_whitespace()
+    if pos < len(buffer):
+        raise ValueError("Лишние данные после JSON-массива")
+
+def parse_task_record(record: Any) -> Optional[Tuple[str, Optional[str], int]]:
+    """
+    Преобразование записи файла в задачу
+
+    Args:
+        record: Запись из файла импорта
+
+    Returns:
+        Optional[Tuple[str, Optional[str], int]]: Название, описание и статус задачи
+        или None, если запись некорректна
+    """
+    if not isinstance(record, dict):
+        return None
+    title = str(record.get("title") or "").strip()
+    if not title:
+        return None
+    description = record.get("description")
+    if description is not None:
+        description = str(description).strip() or None
+    status = 1 if str(record.get("status", "")).strip().lower() in DONE_STATUSES else 0
+    return title, description, status
+
+def batched(items: Iterable[Any], size: int) -> Iterator[List[Any]]:
+    """
+    Разбиение итератора на порции
+
+    Args:
+        items: Исходный итератор
+        size: Размер порции
+
+    Returns:
+        Iterator[List[Any]]: Итератор по порциям
+    """
+    batch = []
+    for item in items:
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+class TaskExportWriter:
+    """Класс для потоковой записи задач в файл экспорта"""
+
+    def __init__(self, file: TextIO, fmt: str):
+        """
+        Инициализация записи
+
+        Args:
+            file: Открытый текстовый файл
+            fmt: Формат файла (csv или json)
+        """
+        if fmt not in EXPORT_FORMATS:
+            raise ValueError(f"Неподдерживаемый формат: {fmt}")
+        self.file = file
+        self.fmt = fmt
+        self._count = 0
+        if fmt == "csv":
+            self._csv_writer = csv.writer(file)
+            self._csv_writer.writerow(EXPORT_FIELDS)
+        else:
+            file.write("[")
+
+    def write_rows(self, rows: Iterable[Tuple]) -> None:
+        """
+        Запись порции задач
+
+        Args:
+            rows: Строки задач в порядке полей EXPORT_FIELDS
+        """
+        for row in rows:
+            if self.fmt == "csv":
+                self._csv_writer.writerow(tuple(row))
+            else:
+                if self._count:
+                    self.file.write(",")
+                self.file.write("\n")
+                json.dump(dict(zip(EXPORT_FIELDS, tuple(row))), self.file, ensure_ascii=False)
+            self._count += 1
+
+    def close(self) -> None:
+        """Завершение записи файла"""
+        if self.fmt == "json":
+            self.file.write("\n]\n" if self._count else "]\n")
+        self.file.flush()
@@ -0,0 +1,128 @@
+import asyncio
+import os
+import sqlite3
+import tempfile
+import time
+import unittest
+
+from backup_manager import BackupManager
+from db_manager import DatabaseManager
+
+
+class BackupManagerTest(unittest.TestCase):
+    """Тесты резервного копирования базы данных"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.db = DatabaseManager(os.path.join(self.tmp.name, "tasks.db"))
+        self.backup_dir = os.path.join(self.tmp.name, "backups")
+
+    def tearDown(self):
+        self.db.conn.close()
+        del self.db
+        self.tmp.cleanup()
+
+    def count_tasks(self, path: str) -> int:
+        conn = sqlite3.connect(path)
+        try:
+            return conn.execute("SELECT COUNT(*) FROM tasks").fetchone()[0]
+        finally:
+            conn.close()
+
+    def test_backup_completes_while_writes_are_running(self):
+        self.db.add_tasks_batch(1, 1, [("x" * 1000, None, 0)] * 20000)
+        manager = BackupManager(self.db, self.backup_dir)
+        writes = 0
+
+        async def writer(done: asyncio.Event) -> None:
+            nonlocal writes
+            while not done.is_set():
+                self.db.add_task(1, 1, "во время копирования")
+                writes += 1
+                await asyncio.sleep(0.001)
+
+        async def main() -> str:
+            done = asyncio.Event()
+            writer_task = asyncio.create_task(writer(done))
+            try:
+                return await asyncio.wait_for(manager.create_backup(), timeout=10)
+            finally:
+                done.set()
+                await writer_task
+
+        path = asyncio.run(main())
+        self.assertGreater(writes, 0)
+        self.assertGreaterEqual(self.count_tasks(path), 20000)
+        self.assertEqual(self.count_tasks(self.db.db_path), 20000 + writes)
+
+    def test_cancelled_backup_finishes_before_releasing_lock(self):
+        self.db.add_tasks_batch(1, 1, [("x" * 1000, None, 0)] * 5000)
+        manager = BackupManager(self.db, self.backup_dir, keep=1)
+
+        async def main() -> None:
+            await manager.create_backup()
+            task = asyncio.create_task(manager.create_backup())
+            await asyncio.sleep(0.001)
+            task.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await task
+            self.assertFalse(manager.in_progress)
+            self.assertFalse(manager._lock.locked())
+
+        asyncio.run(main())
+        self.assertEqual(len(manager.list_backups()), 1)
+        self.assertEqual(
+            [name for name in os.listdir(self.backup_dir) if name.endswith(".tmp")], []
+        )
+
+    def test_restore_keeps_restored_snapshot(self):
+        manager = BackupManager(self.db, self.backup_dir, keep=2)
+        self.db.add_task(1, 1, "первая")
+
+        async def main() -> str:
+            oldest = os.path.basename(await manager.create_backup())
+            await manager.create_backup()
+            self.db.add_task(1, 1, "вторая")
+            await manager.restore(oldest)
+            return oldest
+
+        oldest = asyncio.run(main())
+        self.assertIn(oldest, manager.list_backups())
+        self.assertEqual(len(self.db.get_user_tasks(1, 1)), 1)
+
+    def test_restore_does_not_block_event_loop(self):
+        manager = BackupManager(self.db, self.backup_dir)
+        self.db.add_tasks_batch(1, 1, [("x" * 1000, None, 0)] * 50000)
+        max_gap = 0.0
+
+        async def ticker(done: asyncio.Event) -> None:
+            nonlocal max_gap
+            last = time.monotonic()
+            while not done.is_set():
+                await asyncio.sleep(0.001)
+                now = time.monotonic()
+                max_gap = max(max_gap, now - last)
+                last = now
+
+        async def main() -> None:
+            name = os.path.basename(await manager.create_backup())
+            self.db.add_task(1, 1, "после копии")
+            done = asyncio.Event()
+            ticker_task = asyncio.create_task(ticker(done))
+            try:
+                await manager.restore(name)
+            finally:
+                done.set()
+                await ticker_task
+
+        asyncio.run(main())
+        self.assertLess(max_gap, 0.05)
+        self.assertEqual(len(self.db.get_user_tasks(1, 1)), 50000)
+
+    def test_keep_must_be_positive(self):
+        with self.assertRaises(ValueError):
+            BackupManager(self.db, self.backup_dir, keep=0)
+
+
+if __name__ == "__main__":
+    unittest.main()
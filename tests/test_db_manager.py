@@ -0,0 +1,134 @@
+import os
+import sqlite3
+import tempfile
+import unittest
+
+from db_manager import DatabaseManager
+
+
+class BroadcastCheckpointTest(unittest.TestCase):
+    """Тесты постраничного чтения пользователей и контрольных точек рассылки"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.db = DatabaseManager(os.path.join(self.tmp.name, "tasks.db"))
+
+    def tearDown(self):
+        self.db.conn.close()
+        del self.db
+        self.tmp.cleanup()
+
+    def test_users_are_chunked_by_keyset_per_bot(self):
+        for user_id in (5, 1, 9, 3, 7):
+            self.db.add_user(100, user_id, f"user{user_id}")
+        self.db.add_user(200, 2, "other")
+
+        chunks = []
+        last_user_id = 0
+        while True:
+            user_ids = self.db.get_users_after(100, last_user_id, 2)
+            if not user_ids:
+                break
+            chunks.append(user_ids)
+            last_user_id = user_ids[-1]
+
+        self.assertEqual(chunks, [[1, 3], [5, 7], [9]])
+        self.assertEqual(self.db.get_users_after(200, 0, 10), [2])
+
+    def test_resume_from_checkpoint(self):
+        for user_id in range(1, 6):
+            self.db.add_user(100, user_id, f"user{user_id}")
+        broadcast_id = self.db.create_broadcast(100, 1, "привет")
+        self.db.update_broadcast_progress(broadcast_id, 3, delivered=2, blocked=1, failed=0)
+
+        # Перезапуск: новое соединение с той же базой
+        self.db.conn.close()
+        self.db = DatabaseManager(self.db.db_path)
+
+        rows = [tuple(row) for row in self.db.get_unfinished_broadcasts()]
+        self.assertEqual(rows, [(broadcast_id, 100, 1, "привет", 3, 2, 1, 0)])
+        self.assertEqual(self.db.get_users_after(100, 3, 10), [4, 5])
+
+        self.db.finish_broadcast(broadcast_id)
+        self.assertEqual(self.db.get_unfinished_broadcasts(), [])
+
+
+class TenantMigrationTest(unittest.TestCase):
+    """Тесты перевода базы старого формата на многоарендную схему"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "tasks.db")
+        # Схема базы до появления bot_id
+        conn = sqlite3.connect(self.path)
+        conn.executescript("""
+            CREATE TABLE users (
+                user_id INTEGER PRIMARY KEY,
+                username TEXT NOT NULL,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            );
+            CREATE TABLE tasks (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                user_id INTEGER NOT NULL,
+                title TEXT NOT NULL,
+                description TEXT,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                status INTEGER DEFAULT 0,
+                FOREIGN KEY (user_id) REFERENCES users (user_id)
+            );
+            INSERT INTO users (user_id, username) VALUES (1, 'first'), (2, 'second');
+            INSERT INTO tasks (user_id, title, description, status) VALUES
+                (1, 'a', 'описание', 0), (2, 'b', NULL, 1), (1, 'c', NULL, 0), (1, 'удаленная', NULL, 0);
+            DELETE FROM tasks WHERE id = 4;
+        """)
+        conn.close()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def open(self) -> DatabaseManager:
+        db = DatabaseManager(self.path)
+        self.addCleanup(db.conn.close)
+        return db
+
+    def dump(self, db: DatabaseManager) -> dict:
+        cursor = db.conn.cursor()
+        return {
+            "users": [tuple(row) for row in cursor.execute(
+                "SELECT bot_id, user_id, username FROM users ORDER BY bot_id, user_id")],
+            "tasks": [tuple(row) for row in cursor.execute(
+                "SELECT id, bot_id, user_id, title, description, status FROM tasks ORDER BY id")],
+            "seq": cursor.execute("SELECT seq FROM sqlite_sequence WHERE name = 'tasks'").fetchone()[0],
+        }
+
+    def test_migration_keeps_rows_ids_and_sequence(self):
+        db = self.open()
+        db.claim_legacy_rows(100)
+
+        self.assertEqual(self.dump(db), {
+            "users": [(100, 1, "first"), (100, 2, "second")],
+            "tasks": [(1, 100, 1, "a", "описание", 0), (2, 100, 2, "b", None, 1), (3, 100, 1, "c", None, 0)],
+            "seq": 4,
+        })
+        foreign_keys = db.conn.execute("PRAGMA foreign_key_list(tasks)").fetchall()
+        self.assertEqual(
+            sorted((row["table"], row["from"], row["to"]) for row in foreign_keys),
+            [("users", "bot_id", "bot_id"), ("users", "user_id", "user_id")]
+        )
+        self.assertEqual(db.add_task(100, 1, "новая"), 5)
+
+    def test_second_run_changes_nothing(self):
+        db = self.open()
+        db.claim_legacy_rows(100)
+        before = self.dump(db)
+        schema = db.conn.execute("SELECT sql FROM sqlite_master ORDER BY name").fetchall()
+        db.conn.close()
+
+        db = self.open()
+        db.claim_legacy_rows(200)
+        self.assertEqual(self.dump(db), before)
+        self.assertEqual(db.conn.execute("SELECT sql FROM sqlite_master ORDER BY name").fetchall(), schema)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,57 @@
+import asyncio
+import time
+import unittest
+
+from rate_limiter import RateLimiter
+
+
+class RateLimiterTest(unittest.TestCase):
+    """Тесты ограничителя частоты запросов"""
+
+    def test_paces_calls(self):
+        limiter = RateLimiter(50)
+
+        async def main() -> list:
+            started = time.monotonic()
+            times = []
+            for _ in range(6):
+                await limiter.wait()
+                times.append(time.monotonic() - started)
+            return times
+
+        times = asyncio.run(main())
+        # Первый вызов сразу, далее не чаще одного раза в 20 мс
+        self.assertLess(times[0], 0.01)
+        for previous, current in zip(times, times[1:]):
+            self.assertGreaterEqual(current - previous, 0.019)
+
+    def test_pause_delays_next_call(self):
+        limiter = RateLimiter(100)
+
+        async def main() -> float:
+            await limiter.wait()
+            limiter.pause(0.2)
+            started = time.monotonic()
+            await limiter.wait()
+            return time.monotonic() - started
+
+        self.assertGreaterEqual(asyncio.run(main()), 0.19)
+
+    def test_pause_delays_waiter_already_sleeping(self):
+        limiter = RateLimiter(2)
+
+        async def main() -> float:
+            await limiter.wait()
+            started = time.monotonic()
+            waiter = asyncio.create_task(limiter.wait())
+            await asyncio.sleep(0.1)
+            # Ожидающий уже спит до своего слота (0.5 с), пауза должна его задержать
+            limiter.pause(1.0)
+            await waiter
+            return time.monotonic() - started
+
+        self.assertGreaterEqual(asyncio.run(main()), 1.05)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,70 @@
+import io
+import json
+import unittest
+
+from task_io import TaskExportWriter, _iter_json_array, iter_task_records, parse_task_record
+
+
+class IterJsonArrayTest(unittest.TestCase):
+    """Тесты потокового разбора JSON-массива"""
+
+    def parse(self, text: str, chunk_size: int = 4) -> list:
+        return list(_iter_json_array(io.StringIO(text), chunk_size=chunk_size))
+
+    def test_matches_json_loads_for_any_chunk_size(self):
+        text = json.dumps([{"title": "a", "description": "б"}, 12345, "строка", [1, 2], None, 1.5e10])
+        for chunk_size in range(1, len(text) + 1):
+            self.assertEqual(self.parse(text, chunk_size), json.loads(text))
+
+    def test_scalar_at_chunk_boundary_is_not_split(self):
+        text = '[{"title":"a"}, 12345, {"title":"b"}]'
+        self.assertEqual(self.parse(text, chunk_size=30), [{"title": "a"}, 12345, {"title": "b"}])
+
+    def test_empty_array(self):
+        self.assertEqual(self.parse("  [ ] "), [])
+
+    def test_invalid_separators_are_rejected(self):
+        for text in ['[{"a": 1} {"b": 2}]', '[{"a": 1},,{"b": 2}]', '[,{"a": 1}]', '[{"a": 1},]']:
+            with self.subTest(text=text), self.assertRaises(ValueError):
+                self.parse(text)
+
+    def test_truncated_file_is_rejected(self):
+        for text in ['[{"a": 1}, {"b"', '[{"a": 1}', "[1,"]:
+            with self.subTest(text=text), self.assertRaises(ValueError):
+                self.parse(text)
+
+    def test_not_an_array_is_rejected(self):
+        with self.assertRaises(ValueError):
+            self.parse('{"title": "a"}')
+
+    def test_trailing_data_is_rejected(self):
+        for text in ["[1] trailing garbage", "[1]]", "[] [2]"]:
+            with self.subTest(text=text), self.assertRaises(ValueError):
+                self.parse(text)
+        self.assertEqual(self.parse("[1] \n\t "), [1])
+
+    def test_large_element_spanning_many_chunks(self):
+        record = {"title": "a", "description": "x" * 100000}
+        text = json.dumps([record, 1])
+        self.assertEqual(self.parse(text, chunk_size=16), [record, 1])
+
+
+class ExportImportTest(unittest.TestCase):
+    """Тесты совместимости экспорта и импорта"""
+
+    rows = [(1, "a", "d", "2024-01-01 00:00:00", 1), (2, "b", None, "2024-01-02 00:00:00", 0)]
+
+    def test_round_trip(self):
+        for fmt in ("csv", "json"):
+            with self.subTest(fmt=fmt):
+                file = io.StringIO()
+                writer = TaskExportWriter(file, fmt)
+                writer.write_rows(self.rows)
+                writer.close()
+                file.seek(0)
+                tasks = [parse_task_record(record) for record in iter_task_records(file, fmt)]
+                self.assertEqual(tasks, [("a", "d", 1), ("b", None, 0)])
+
+
+if __name__ == "__main__":
+    unittest.main()